@@ -2,45 +2,43 @@
 
 from __future__ import annotations
 
+import importlib
 import json
+import logging
 import os
 import re
 import sys
+import threading
 import asyncio
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional
 from zoneinfo import ZoneInfo
 
 from openai import OpenAI
 
+try:  # Optional speedup; the stdlib json path below behaves the same.
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 EXAMPLE_BOOKING_PATH = PROJECT_ROOT / "example_booking.json"
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
+from app.console import read_line  # noqa: E402  (needs PROJECT_ROOT on sys.path)
+from app.envfile import load_env_file  # noqa: E402
+from app.libraries import normalize_library  # noqa: E402
+
+if TYPE_CHECKING:
+    from app.browser.booking_flow import BrowserPool
+
 MEL_TZ = ZoneInfo("Australia/Melbourne")
 
 SPACE_LABEL = "Book a Space in a Library"
-ALLOWED_LIBRARIES = {
-    "fbe building": "FBE Building",
-    "eastern resource centre library": "EASTERN RESOURCE CENTRE LIBRARY",
-    "baillieu library": "Baillieu Library",
-    "southbank the hub": "Southbank The Hub",
-    "werribee learning & teaching building": "Werribee Learning & Teaching Building",
-}
-
-LIBRARY_SYNONYMS = {
-    "fbe": "FBE Building",
-    "business and economics": "FBE Building",
-    "erc": "EASTERN RESOURCE CENTRE LIBRARY",
-    "eastern resource center": "EASTERN RESOURCE CENTRE LIBRARY",
-    "baillieu": "Baillieu Library",
-    "southbank": "Southbank The Hub",
-    "the hub": "Southbank The Hub",
-    "werribee": "Werribee Learning & Teaching Building",
-    "learning and teaching building": "Werribee Learning & Teaching Building",
-}
 
 
 def _agent_prefix() -> str:
@@ -77,59 +75,45 @@ def _headless_flag(default: bool = True) -> bool:
 def load_env() -> None:
     """Lightweight .env loader (only sets variables that aren't already set)."""
 
-    env_path = PROJECT_ROOT / ".env"
-    if not env_path.exists():
-        return
-    for line in env_path.read_text().splitlines():
-        line = line.strip()
-        if not line or line.startswith("#") or "=" not in line:
-            continue
-        key, _, value = line.partition("=")
-        os.environ.setdefault(key.strip(), value.strip())
+    load_env_file(PROJECT_ROOT / ".env")
 
 
-def _normalize_library(raw: Optional[str]) -> Optional[str]:
-    if not raw:
-        return None
-    value = raw.strip().lower()
-    if value in ALLOWED_LIBRARIES:
-        return ALLOWED_LIBRARIES[value]
-    # Accept loose nicknames by mapping to the canonical label.
-    for key, canonical in LIBRARY_SYNONYMS.items():
-        if key in value:
-            return canonical
-    return None
+_MIDNIGHT = time(0, 0)
+_NO_DAYS = timedelta()
+_ONE_WEEK = timedelta(days=7)
+_WEEKDAYS = {
+    "monday": 0,
+    "tuesday": 1,
+    "wednesday": 2,
+    "thursday": 3,
+    "friday": 4,
+    "saturday": 5,
+    "sunday": 6,
+}
 
 
 def _mel_now() -> datetime:
     return datetime.now(MEL_TZ)
 
 
-def _next_weekday(target_weekday: int, *, prefer_next_week: bool = False) -> datetime:
+def _next_weekday(
+    target_weekday: int, *, prefer_next_week: bool = False, today: Optional[date] = None
+) -> datetime:
     """Return the next occurrence of the weekday (0=Mon)."""
 
-    today = _mel_now().date()
-    base = today + (timedelta(days=7) if prefer_next_week else timedelta())
+    today = today or _mel_now().date()
+    base = today + (_ONE_WEEK if prefer_next_week else _NO_DAYS)
     days_ahead = (target_weekday - base.weekday()) % 7
     if days_ahead == 0:
         days_ahead = 7
     result_date = base + timedelta(days=days_ahead)
-    return datetime.combine(result_date, datetime.min.time(), MEL_TZ)
+    return datetime.combine(result_date, _MIDNIGHT, MEL_TZ)
 
 
-def _parse_relative_date(text: str) -> Optional[datetime]:
+def _parse_relative_date(text: str, today: Optional[date] = None) -> Optional[datetime]:
     lowered = text.lower()
-    weekdays = {
-        "monday": 0,
-        "tuesday": 1,
-        "wednesday": 2,
-        "thursday": 3,
-        "friday": 4,
-        "saturday": 5,
-        "sunday": 6,
-    }
     target = None
-    for name, idx in weekdays.items():
+    for name, idx in _WEEKDAYS.items():
         if name in lowered:
             target = idx
             break
@@ -137,64 +121,137 @@ def _parse_relative_date(text: str) -> Optional[datetime]:
         return None
 
     prefer_next_week = "next week" in lowered
-    return _next_weekday(target, prefer_next_week=prefer_next_week)
+    return _next_weekday(target, prefer_next_week=prefer_next_week, today=today)
+
+
+# One pass over the supported shapes: YYYY-MM-DD, DD/MM[/YYYY or /YY],
+# DD-MM[-YYYY] and "DD Mon[ YYYY]" with short or full month names.
+_DATE_RE = re.compile(
+    r"""^(?:
+        (?P<iso_year>\d{4})-(?P<iso_month>\d{1,2})-(?P<iso_day>\d{1,2})
+      | (?P<slash_day>\d{1,2})/(?P<slash_month>\d{1,2})(?:/(?P<slash_year>\d{4}|\d{2}))?
+      | (?P<dash_day>\d{1,2})-(?P<dash_month>\d{1,2})(?:-(?P<dash_year>\d{4}))?
+      | (?P<name_day>\d{1,2})\s+(?P<month_name>[A-Za-z]+)(?:\s+(?P<name_year>\d{4}))?
+    )$""",
+    re.VERBOSE,
+)
+
+_MONTHS = {
+    name: idx
+    for idx, full in enumerate(
+        [
+            "january", "february", "march", "april", "may", "june",
+            "july", "august", "september", "october", "november", "december",
+        ],
+        start=1,
+    )
+    for name in (full, full[:3])
+}
+
+
+def _expand_year(raw: Optional[str]) -> Optional[int]:
+    """Turn a 4- or 2-digit year into an int (2-digit follows strptime's %y pivot)."""
+
+    if not raw:
+        return None
+    year = int(raw)
+    if len(raw) == 2:
+        year += 1900 if year >= 69 else 2000
+    return year
 
 
 def _normalize_date(raw: Optional[str]) -> str:
     if not raw:
         return ""
+    # Key the cache on today's date so relative phrases roll over at midnight.
+    return _normalize_date_on(raw, _mel_now().date())
+
+
+@lru_cache(maxsize=256)
+def _normalize_date_on(raw: str, today: date) -> str:
+    text = raw.strip()
+    # Fast path for zero-padded YYYY-MM-DD, handed straight to the C parser.
+    # The shape check keeps fromisoformat's extra forms (YYYYMMDD, week dates) out.
+    if len(text) == 10 and text[4] == "-" and text[7] == "-":
+        try:
+            return date.fromisoformat(text).strftime("%d/%m/%Y")
+        except ValueError:
+            return ""
 
     # Relative phrases like "next Thursday"
-    relative = _parse_relative_date(raw)
+    relative = _parse_relative_date(text, today)
     if relative:
         return relative.strftime("%d/%m/%Y")
 
-    # Explicit formats with a year.
-    for fmt in ("%d/%m/%Y", "%Y-%m-%d", "%d-%m-%Y", "%d/%m/%y", "%d %b %Y", "%d %B %Y"):
-        try:
-            parsed = datetime.strptime(raw.strip(), fmt).replace(tzinfo=MEL_TZ)
-            return parsed.strftime("%d/%m/%Y")
-        except Exception:
-            continue
-
-    # Day/month without a year -> assume this year, or next if already passed.
-    for fmt in ("%d/%m", "%d-%m", "%d %b", "%d %B"):
-        try:
-            today = _mel_now().date()
-            text = raw.strip()
-            if "%b" in fmt or "%B" in fmt:
-                text_fmt = f"{fmt} %Y"
-                text_val = f"{text} {today.year}"
-            elif "/" in fmt:
-                text_fmt = fmt + "/%Y"
-                text_val = f"{text}/{today.year}"
-            elif "-" in fmt:
-                text_fmt = fmt + "-%Y"
-                text_val = f"{text}-{today.year}"
-            else:
-                text_fmt = fmt + " %Y"
-                text_val = f"{text} {today.year}"
-
-            candidate = datetime.strptime(text_val, text_fmt).replace(tzinfo=MEL_TZ)
-            if candidate.date() < today:
-                candidate = candidate.replace(year=today.year + 1)
-            return candidate.strftime("%d/%m/%Y")
-        except Exception:
-            continue
-
-    return ""
+    match = _DATE_RE.match(text)
+    if not match:
+        return ""
+    groups = match.groupdict()
+    try:
+        if groups["iso_year"]:
+            year = int(groups["iso_year"])
+            month = int(groups["iso_month"])
+            day = int(groups["iso_day"])
+        elif groups["slash_day"]:
+            day = int(groups["slash_day"])
+            month = int(groups["slash_month"])
+            year = _expand_year(groups["slash_year"])
+        elif groups["dash_day"]:
+            day = int(groups["dash_day"])
+            month = int(groups["dash_month"])
+            year = _expand_year(groups["dash_year"])
+        else:
+            day = int(groups["name_day"])
+            month = _MONTHS.get(groups["month_name"].lower(), 0)
+            year = int(groups["name_year"]) if groups["name_year"] else None
+
+        if year is None:
+            # Day/month without a year -> assume this year, or next if already passed.
+            year = today.year + ((month, day) < (today.month, today.day))
+        date(year, month, day)  # only to validate; raises ValueError for 31/04 etc.
+        return f"{day:02d}/{month:02d}/{year}"
+    except ValueError:
+        return ""
 
 
+@lru_cache(maxsize=256)
 def _normalize_time(raw: Optional[str]) -> str:
+    """Accept HH:MM, HHMM, H[:MM]am/pm (optionally spaced) and return HH:MM."""
+
     if not raw:
         return ""
-    for fmt in ("%H:%M", "%H%M", "%I:%M%p", "%I:%M %p", "%I%p", "%I %p"):
-        try:
-            parsed = datetime.strptime(raw.strip(), fmt)
-            return parsed.strftime("%H:%M")
-        except Exception:
-            continue
-    return ""
+    text = raw.strip().lower()
+    meridiem = ""
+    if text.endswith(("am", "pm")):
+        meridiem = text[-2:]
+        text = text[:-2].rstrip()
+
+    if ":" in text:
+        hour_text, _, minute_text = text.partition(":")
+    elif meridiem:
+        hour_text, minute_text = text, "00"
+    elif len(text) in (3, 4):
+        hour_text, minute_text = text[:-2], text[-2:]
+    else:
+        return ""
+
+    if not (
+        hour_text.isdigit()
+        and minute_text.isdigit()
+        and len(hour_text) <= 2
+        and len(minute_text) <= 2
+    ):
+        return ""
+    hour, minute = int(hour_text), int(minute_text)
+    if minute > 59:
+        return ""
+    if meridiem:
+        if not 1 <= hour <= 12:
+            return ""
+        hour = hour % 12 + (12 if meridiem == "pm" else 0)
+    elif hour > 23:
+        return ""
+    return f"{hour:02d}:{minute:02d}"
 
 
 def _normalize_capacity(raw: Any) -> int:
@@ -204,22 +261,31 @@ def _normalize_capacity(raw: Any) -> int:
         return 0
 
 
+# Byte table keeping a-z/0-9 and mapping everything else to "-".
+_SLUG_TABLE = bytes(c if 48 <= c <= 57 or 97 <= c <= 122 else 45 for c in range(256))
+
+
+def _json_loads(text: str) -> Any:
+    return orjson.loads(text) if orjson else json.loads(text)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize to indented UTF-8 JSON bytes, ready for Path.write_bytes."""
+
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode()
+
+
 def _parse_json_payload(text: str) -> Dict[str, Any]:
-    try:
-        return json.loads(text)
-    except Exception:
-        # If the model wrapped JSON in chatter, grab the first brace block.
-        match = re.search(r"\{.*\}", text, re.DOTALL)
-        if match:
-            return json.loads(match.group(0))
-        raise
+    return _json_loads(text)
 
 
 def _validate_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
     # Ensure every downstream consumer sees a consistent shape.
     return {
         "space": SPACE_LABEL,
-        "preferred_library": _normalize_library(payload.get("preferred_library"))
+        "preferred_library": normalize_library(payload.get("preferred_library"))
         or None,
         "min_capacity": _normalize_capacity(payload.get("min_capacity")),
         "date": _normalize_date(payload.get("date")),
@@ -229,44 +295,113 @@ def _validate_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def booking_agent(prompt: str, *, model: str = "gpt-4o-mini") -> Dict[str, Any]:
-    """Use OpenAI to draft booking fields, then enforce local normalization."""
+SYSTEM_PROMPT = (
+    "You extract UniMelb library room booking fields from user messages. "
+    "Respond ONLY with JSON with keys: space, preferred_library, min_capacity, "
+    "date, start_time, end_time, event_name. "
+    "space must be exactly 'Book a Space in a Library'. "
+    "preferred_library must be null or one of: "
+    "FBE Building, EASTERN RESOURCE CENTRE LIBRARY, Baillieu Library, "
+    "Southbank The Hub, Werribee Learning & Teaching Building. "
+    "For date, copy the user's wording (e.g., 'next Thursday' or '12/12'); "
+    "do NOT invent or assume a year. "
+    "time is HH:MM 24-hour. "
+    "min_capacity is an integer. event_name is a short string."
+)
+
+
+def _api_key() -> str:
     load_env()
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise RuntimeError("OPENAI_API_KEY is not set")
+    return api_key
 
-    client = OpenAI(api_key=api_key)
-    system = (
-        "You extract UniMelb library room booking fields from user messages. "
-        "Respond ONLY with JSON with keys: space, preferred_library, min_capacity, "
-        "date, start_time, end_time, event_name. "
-        "space must be exactly 'Book a Space in a Library'. "
-        "preferred_library must be null or one of: "
-        "FBE Building, EASTERN RESOURCE CENTRE LIBRARY, Baillieu Library, "
-        "Southbank The Hub, Werribee Learning & Teaching Building. "
-        "For date, copy the user's wording (e.g., 'next Thursday' or '12/12'); "
-        "do NOT invent or assume a year. "
-        "time is HH:MM 24-hour. "
-        "min_capacity is an integer. event_name is a short string."
-    )
 
-    completion = client.chat.completions.create(
-        model=model,
-        temperature=0,
-        messages=[
+def _get_client() -> OpenAI:
+    """Return a process-wide OpenAI client so its connection pool is reused."""
+
+    return _client_for_key(_api_key())
+
+
+@lru_cache(maxsize=1)
+def _client_for_key(api_key: str) -> OpenAI:
+    return OpenAI(api_key=api_key)
+
+
+# Exact-match completion cache. Only the content string is stored so entries
+# stay small.
+_COMPLETION_CACHE: OrderedDict[tuple[str, str, str], str] = OrderedDict()
+_COMPLETION_CACHE_SIZE = 512
+# booking_agent_async runs lookups on executor threads, so guard the LRU updates.
+_COMPLETION_CACHE_LOCK = threading.Lock()
+
+
+def _cache_get(key: tuple[str, str, str]) -> Optional[str]:
+    with _COMPLETION_CACHE_LOCK:
+        content = _COMPLETION_CACHE.get(key)
+        if content is not None:
+            _COMPLETION_CACHE.move_to_end(key)
+        return content
+
+
+def _cache_put(key: tuple[str, str, str], content: str) -> None:
+    with _COMPLETION_CACHE_LOCK:
+        _COMPLETION_CACHE[key] = content
+        if len(_COMPLETION_CACHE) > _COMPLETION_CACHE_SIZE:
+            _COMPLETION_CACHE.popitem(last=False)
+
+
+def _completion_kwargs(model: str, system: str, prompt: str) -> Dict[str, Any]:
+    return {
+        "model": model,
+        "temperature": 0,
+        # JSON mode guarantees a bare object, so no brace-scraping fallback is needed.
+        "response_format": {"type": "json_object"},
+        "messages": [
             {"role": "system", "content": system},
             {"role": "user", "content": prompt},
         ],
-    )
-    content = completion.choices[0].message.content or "{}"
+    }
+
+
+def _cached_llm_call(model: str, system: str, prompt: str) -> str:
+    """Return the raw completion text, cached on the exact (model, system, prompt)."""
+
+    key = (model, system, prompt)
+    content = _cache_get(key)
+    if content is None:
+        completion = _get_client().chat.completions.create(
+            **_completion_kwargs(model, system, prompt)
+        )
+        content = completion.choices[0].message.content or "{}"
+        _cache_put(key, content)
+    return content
+
+
+def booking_agent(prompt: str, *, model: str = "gpt-4o-mini") -> Dict[str, Any]:
+    """Use OpenAI to draft booking fields, then enforce local normalization."""
+    # Relative dates are resolved locally, so a cached reply never goes stale.
+    content = _cached_llm_call(model, SYSTEM_PROMPT, prompt.strip())
     raw_payload = _parse_json_payload(content)
     return _validate_payload(raw_payload)
 
 
+async def booking_agent_async(prompt: str, *, model: str = "gpt-4o-mini") -> Dict[str, Any]:
+    """booking_agent on a worker thread, so the event loop keeps running meanwhile.
+
+    Reuses the process-wide sync client rather than an AsyncOpenAI one, whose
+    connections would be tied to whichever event loop first used them.
+    """
+    return await asyncio.to_thread(booking_agent, prompt, model=model)
+
+
 def _slugify(text: str) -> str:
-    slug = re.sub(r"[^a-z0-9]+", "-", text.strip().lower())
-    return slug.strip("-") or "booking"
+    # "replace" turns each non-ASCII char into "?", which the table maps to "-".
+    raw = text.strip().lower().encode("ascii", "replace").translate(_SLUG_TABLE)
+    # Splitting on "-" and dropping empties collapses runs and trims the ends.
+    slug = "-".join(part for part in raw.decode("ascii").split("-") if part)
+    return slug or "booking"
 
 
 def _filename_for_result(result: Dict[str, Any]) -> str:
@@ -291,13 +426,13 @@ def booking_agent_to_file(
 
     result = booking_agent(prompt, model=model)
     target = Path(path) if path else PROJECT_ROOT / _filename_for_result(result)
-    target.write_text(json.dumps(result, indent=2))
+    target.write_bytes(_json_dumps(result))
     return result
 
 
 def _write_payload_to_file(payload: Dict[str, Any], path: Optional[Path] = None) -> Path:
     target = Path(path) if path else PROJECT_ROOT / _filename_for_result(payload)
-    target.write_text(json.dumps(payload, indent=2))
+    target.write_bytes(_json_dumps(payload))
     return target
 
 
@@ -312,6 +447,19 @@ def _format_booking_summary(payload: Dict[str, Any]) -> str:
     return f"{event} at {library} on {date} from {start}–{end} for {capacity} people."
 
 
+# Required fields in prompt order, with the label shown when one is missing.
+_REQUIRED_FIELDS = (
+    ("preferred_library", "library (pick from the allowed list)"),
+    ("date", "date (DD/MM/YYYY)"),
+    ("start_time", "start time (HH:MM)"),
+    ("end_time", "end time (HH:MM)"),
+    ("min_capacity", "capacity (integer)"),
+    ("event_name", "event name"),
+)
+_FIELD_BITS = {key: 1 << idx for idx, (key, _) in enumerate(_REQUIRED_FIELDS)}
+_ALL_FIELDS_FILLED = (1 << len(_REQUIRED_FIELDS)) - 1
+
+
 class BookingSession:
     """Stateful helper to collect booking fields across turns."""
 
@@ -328,41 +476,54 @@ class BookingSession:
             "event_name": "",
         }
         self.awaiting_confirmation = False
-
-    def update_from_prompt(self, prompt: str, allowed: Optional[set[str]] = None) -> None:
-        parsed = booking_agent(prompt, model=self.model)
+        # Bitmask of required fields that hold a value; fields only ever get
+        # filled (never cleared), so _merge just ORs bits in.
+        self._filled = 0
+        # Validated payloads per prompt, so a repeated message within this
+        # session skips the LLM call and normalization entirely.
+        self._parse_cache: Dict[str, Dict[str, Any]] = {}
+
+    async def update_from_prompt_async(
+        self, prompt: str, allowed: Optional[set[str]] = None
+    ) -> None:
+        key = prompt.strip()
+        parsed = self._parse_cache.get(key)
+        if parsed is None:
+            parsed = await booking_agent_async(key, model=self.model)
+            if len(self._parse_cache) >= 64:
+                self._parse_cache.clear()
+            self._parse_cache[key] = parsed
+        self._merge(parsed, allowed)
+
+    def _merge(self, parsed: Dict[str, Any], allowed: Optional[set[str]]) -> None:
         for key in self.fields:
             # When tweaking an existing summary, only touch the allowed fields.
             if allowed is not None and key not in allowed:
                 continue
             value = parsed.get(key)
             if key == "min_capacity":
-                if isinstance(value, int) and value > 0:
-                    self.fields[key] = value
+                if not (isinstance(value, int) and value > 0):
+                    continue
             elif isinstance(value, str):
-                if value.strip():
-                    self.fields[key] = value.strip()
-            elif value:
-                self.fields[key] = value
+                value = value.strip()
+                if not value:
+                    continue
+            elif not value:
+                continue
+            self.fields[key] = value
+            self._filled |= _FIELD_BITS.get(key, 0)
 
     def missing_fields(self) -> list[str]:
-        missing: list[str] = []
-        if not self.fields["preferred_library"]:
-            missing.append("library (pick from the allowed list)")
-        if not self.fields["date"]:
-            missing.append("date (DD/MM/YYYY)")
-        if not self.fields["start_time"]:
-            missing.append("start time (HH:MM)")
-        if not self.fields["end_time"]:
-            missing.append("end time (HH:MM)")
-        if not self.fields["min_capacity"]:
-            missing.append("capacity (integer)")
-        if not self.fields["event_name"]:
-            missing.append("event name")
-        return missing
+        if self._filled == _ALL_FIELDS_FILLED:
+            return []
+        return [
+            label
+            for key, label in _REQUIRED_FIELDS
+            if not self._filled & _FIELD_BITS[key]
+        ]
 
     def has_all_fields(self) -> bool:
-        return not self.missing_fields()
+        return self._filled == _ALL_FIELDS_FILLED
 
     def payload(self) -> Dict[str, Any]:
         return {
@@ -376,18 +537,12 @@ class BookingSession:
         }
 
 
-def _looks_like_booking_intent(text: str) -> bool:
-    lowered = text.lower()
-    return any(
-        kw in lowered
-        for kw in ["book", "booking", "reserve", "room", "library room", "dibs"]
-    )
+# Substring match (no word boundaries) so "booked" or "classroom" still count,
+# same as the original keyword scan; "booking"/"library room" are implied.
+_BOOKING_INTENT_RE = re.compile(r"book|reserve|room|dibs", re.IGNORECASE)
 
-
-def _is_yes(text: str) -> bool:
-    """Detect natural 'yes' style confirmations."""
-    normalized = text.strip().lower()
-    direct_yes = {
+_YES_DIRECT = frozenset(
+    {
         "yes",
         "y",
         "yeah",
@@ -409,184 +564,255 @@ def _is_yes(text: str) -> bool:
         "thats fine",
         "lock it in",
     }
-    if normalized in direct_yes:
+)
+# Catch simple phrases like "looks good to me", "yeah that’s fine"
+_YES_PHRASE_RE = re.compile(
+    r"looks good|sounds good|all good|that’s fine|thats fine|good to me|happy with that"
+)
+
+
+_WORD_RE = re.compile(r"[a-z]+")
+# Words that mark which field a confirmation-time edit is about. Common
+# inflections are listed so whole-word matching still catches "starting" etc.
+_FIELD_KEYWORDS = {
+    "event_name": frozenset(
+        {"event", "events", "name", "named", "rename", "renamed", "title", "titled"}
+    ),
+    "preferred_library": frozenset({"library", "libraries"}),
+    "date": frozenset({"date", "dates"}),
+    "start_time": frozenset({"start", "starts", "starting", "time", "times"}),
+    "end_time": frozenset({"end", "ends", "ending", "time", "times"}),
+    "min_capacity": frozenset({"capacity", "people", "attendees"}),
+}
+
+
+def _looks_like_booking_intent(text: str) -> bool:
+    return _BOOKING_INTENT_RE.search(text) is not None
+
+
+def _is_yes(text: str) -> bool:
+    """Detect natural 'yes' style confirmations."""
+    normalized = text.strip().lower()
+    if normalized in _YES_DIRECT:
         return True
-    # Catch simple phrases like "looks good to me", "yeah that’s fine"
-    return any(
-        phrase in normalized
-        for phrase in [
-            "looks good",
-            "sounds good",
-            "all good",
-            "that’s fine",
-            "thats fine",
-            "good to me",
-            "happy with that",
-        ]
-    )
+    return _YES_PHRASE_RE.search(normalized) is not None
 
 
 def chat_loop(*, model: str = "gpt-4o-mini", persist: bool = True) -> None:
     """Interactive CLI chatbot that switches into booking mode when asked."""
 
+    # Show the browser flow's progress/failure logs alongside the chat.
+    logging.basicConfig(format="%(message)s", stream=sys.stdout)
+    logging.getLogger("app.browser").setLevel(logging.INFO)
+    try:
+        asyncio.run(chat_loop_async(model=model, persist=persist))
+    except KeyboardInterrupt:
+        # asyncio.run re-raises Ctrl+C once the loop has cleaned up.
+        print()
+
+
+async def _prewarm_browser(headless: bool) -> BrowserPool:
+    """Import the Playwright flow and launch Chromium while the user is still typing.
+
+    By confirmation time the browser is usually up, so the booking starts
+    without the import and cold-start wait.
+    """
+
+    flow = await asyncio.to_thread(importlib.import_module, "app.browser.booking_flow")
+    pool = flow.BrowserPool(headless=headless)
+    try:
+        await pool.get()
+    except asyncio.CancelledError:
+        # Cancelled mid-launch: the driver may already be up, and nobody else
+        # will get hold of this pool to stop it.
+        await pool.shutdown()
+        raise
+    except Exception:
+        # The flow retries the launch at confirmation time and reports it there.
+        pass
+    return pool
+
+
+async def _shutdown_prewarmed(warmup: asyncio.Task[BrowserPool]) -> None:
+    warmup.cancel()  # No-op once the warm-up has finished.
+    await asyncio.gather(warmup, return_exceptions=True)
+    if not warmup.cancelled() and warmup.exception() is None:
+        await warmup.result().shutdown()
+
+
+async def chat_loop_async(*, model: str = "gpt-4o-mini", persist: bool = True) -> None:
+    """Async chat loop: LLM calls and the browser flow share one event loop.
+
+    Entering booking mode starts Chromium in a background task, so it warms
+    up while the remaining details are collected and confirmed.
+    """
+
     _agent_print(
         "Hi! I’m your UniMelb library booking helper. Type 'exit' or press Ctrl+C to quit."
     )
     session: Optional[BookingSession] = None
     booking_mode = False
     just_entered_booking = False
+    browser_warmup: Optional[asyncio.Task[BrowserPool]] = None
     # Simple state machine to switch between small talk and booking.
 
-    while True:
-        try:
-            prompt = input("You: ").strip()
-        except (EOFError, KeyboardInterrupt):
-            print()
-            break
-
-        if not prompt or prompt.lower() in {"exit", "quit"}:
-            break
-
-        # Detect booking intent and kick off a session
-        if not booking_mode and _looks_like_booking_intent(prompt):
-            booking_mode = True
-            session = BookingSession(model=model)
+    try:
+        while True:
             try:
-                session.update_from_prompt(prompt)
-            except Exception as exc:
+                # Read without blocking so the browser warm-up keeps going.
+                prompt = (await read_line("You: ")).strip()
+            except (EOFError, KeyboardInterrupt):
+                print()
+                break
+
+            if not prompt or prompt.lower() in {"exit", "quit"}:
+                break
+
+            # Detect booking intent and kick off a session
+            if not booking_mode and _looks_like_booking_intent(prompt):
+                booking_mode = True
+                if persist and browser_warmup is None:
+                    browser_warmup = asyncio.create_task(_prewarm_browser(_headless_flag()))
+                session = BookingSession(model=model)
+                try:
+                    await session.update_from_prompt_async(prompt)
+                except Exception as exc:
+                    _agent_print(
+                        "I had a bit of trouble reading that automatically, "
+                        f"but we can sort it out together. (Error: {exc})"
+                    )
+                missing_now = session.missing_fields() if session else []
+                if session and not missing_now:
+                    session.awaiting_confirmation = True
+                    payload = session.payload()
+                    _agent_print(
+                        "Nice, here’s what I’m thinking: "
+                        + _format_booking_summary(payload)
+                        + " Does that look right? If not, tell me what you'd like to change."
+                    )
+                    continue
+                just_entered_booking = True
                 _agent_print(
-                    "I had a bit of trouble reading that automatically, "
-                    f"but we can sort it out together. (Error: {exc})"
+                    "Great, let’s book a room. Tell me the library, date, "
+                    "start time, end time, how many people, and what the event is called."
                 )
-            missing_now = session.missing_fields() if session else []
-            if session and not missing_now:
-                session.awaiting_confirmation = True
-                payload = session.payload()
+                continue
+
+            # If we’re not in booking mode, just be a simple helper
+            if not booking_mode:
                 _agent_print(
-                    "Nice, here’s what I’m thinking: "
-                    + _format_booking_summary(payload)
-                    + " Does that look right? If not, tell me what you'd like to change."
+                    "If you want to book a library room, try something like "
+                    "'book Baillieu on 14/12, 2–4pm, 5 people, call it Test 6'."
                 )
                 continue
-            just_entered_booking = True
-            _agent_print(
-                "Great, let’s book a room. Tell me the library, date, "
-                "start time, end time, how many people, and what the event is called."
-            )
-            continue
-
-        # If we’re not in booking mode, just be a simple helper
-        if not booking_mode:
-            _agent_print(
-                "If you want to book a library room, try something like "
-                "'book Baillieu on 14/12, 2–4pm, 5 people, call it Test 6'."
-            )
-            continue
 
-        # Booking mode
-        assert session is not None
+            # Booking mode
+            assert session is not None
 
-        # If we're waiting for confirmation and the user confirms, finalize.
-        if session.awaiting_confirmation and _is_yes(prompt):
-            payload = session.payload()
-            target_path = _write_payload_to_file(payload) if persist else None
-            if persist:
-                try:
-                    EXAMPLE_BOOKING_PATH.write_text(json.dumps(payload, indent=2))
-                except Exception as exc:
-                    _agent_print(f"Could not update example booking file: {exc}")
-            if persist:
-                try:
-                    from app.browser import booking_flow
-
-                    # Kick off the browser flow with the confirmed payload.
-                    _agent_print("Starting browser booking flow to search for this slot...")
-                    asyncio.run(
-                        booking_flow.run_login_probe(
-                            headless=_headless_flag(),
-                            pause_before_close=not _headless_flag(),
+            # If we're waiting for confirmation and the user confirms, finalize.
+            if session.awaiting_confirmation and _is_yes(prompt):
+                payload = session.payload()
+                target_path = _write_payload_to_file(payload) if persist else None
+                if persist:
+                    try:
+                        EXAMPLE_BOOKING_PATH.write_bytes(_json_dumps(payload))
+                    except Exception as exc:
+                        _agent_print(f"Could not update example booking file: {exc}")
+                if persist:
+                    try:
+                        assert browser_warmup is not None
+                        pool = await browser_warmup
+                        from app.browser import booking_flow
+
+                        # The flow caches example_booking.json; pick up the new payload.
+                        booking_flow.reload_booking_data()
+                        # Kick off the browser flow with the confirmed payload.
+                        _agent_print("Starting browser booking flow to search for this slot...")
+                        await booking_flow.run_login_probe(
+                            pool=pool,
+                            pause_before_close="never" if pool.headless else "tty",
                         )
-                    )
-                except Exception as exc:
-                    _agent_print(f"Booking flow failed to launch: {exc}")
-            booking_mode = False
-            session = None
-            continue
+                    except Exception as exc:
+                        _agent_print(f"Booking flow failed to launch: {exc}")
+                booking_mode = False
+                session = None
+                continue
 
-        try:
-            allowed_fields: Optional[set[str]] = None
-            if session.awaiting_confirmation:
-                lowered = prompt.lower()
-                allowed_fields = set()
-                # Only nudge the fields the user actually mentioned.
-                if any(word in lowered for word in ["event", "name", "title"]):
-                    allowed_fields.add("event_name")
-                if "library" in lowered:
-                    allowed_fields.add("preferred_library")
-                if "date" in lowered:
-                    allowed_fields.add("date")
-                if "start" in lowered or "time" in lowered:
-                    allowed_fields.add("start_time")
-                if "end" in lowered or "time" in lowered:
-                    allowed_fields.add("end_time")
-                if any(word in lowered for word in ["capacity", "people", "attendees"]):
-                    allowed_fields.add("min_capacity")
-                # If nothing matched, fall back to not changing anything to avoid overwriting.
-                if not allowed_fields:
-                    allowed_fields = set()
-
-            session.update_from_prompt(prompt, allowed=allowed_fields)
-        except Exception as exc:
-            _agent_print(
-                "I couldn’t quite map that to the booking details, "
-                f"but keep going and I’ll adjust what I can. (Error: {exc})"
-            )
+            try:
+                allowed_fields: Optional[set[str]] = None
+                if session.awaiting_confirmation:
+                    # Only nudge the fields the user actually mentioned. If nothing
+                    # matches, the empty set leaves every field untouched.
+                    tokens = set(_WORD_RE.findall(prompt.lower()))
+                    allowed_fields = {
+                        field
+                        for field, keywords in _FIELD_KEYWORDS.items()
+                        if tokens & keywords
+                    }
+
+                await session.update_from_prompt_async(prompt, allowed=allowed_fields)
+            except Exception as exc:
+                _agent_print(
+                    "I couldn’t quite map that to the booking details, "
+                    f"but keep going and I’ll adjust what I can. (Error: {exc})"
+                )
+
+            if just_entered_booking:
+                just_entered_booking = False
+                initial_missing = session.missing_fields()
+                if initial_missing:
+                    _agent_print(
+                        "To kick things off, send me one message with: library, date, "
+                        "start time, end time (HH:MM), capacity, and event name."
+                    )
+                    continue
 
-        if just_entered_booking:
-            just_entered_booking = False
-            initial_missing = session.missing_fields()
-            if initial_missing:
+            missing = session.missing_fields()
+            if missing:
+                session.awaiting_confirmation = False
+                missing_str = ", ".join(missing)
                 _agent_print(
-                    "To kick things off, send me one message with: library, date, "
-                    "start time, end time (HH:MM), capacity, and event name."
+                    f"Almost there — I still need: {missing_str}. "
+                    "Just send those details and I’ll plug them in."
                 )
                 continue
 
-        missing = session.missing_fields()
-        if missing:
-            session.awaiting_confirmation = False
-            missing_str = ", ".join(missing)
-            _agent_print(
-                f"Almost there — I still need: {missing_str}. "
-                "Just send those details and I’ll plug them in."
-            )
-            continue
+            if session.awaiting_confirmation:
+                # We already applied the change; re-summarize.
+                updated = session.payload()
+                _agent_print(
+                    "Updated version: "
+                    + _format_booking_summary(updated)
+                    + " How does that look now? If you’re happy with it, just say "
+                      "'yes' or anything similar; otherwise tell me what to tweak."
+                )
+                session.awaiting_confirmation = True
+                continue
 
-        if session.awaiting_confirmation:
-            # We already applied the change; re-summarize.
-            updated = session.payload()
+            # All fields present, ask for confirmation
+            payload = session.payload()
             _agent_print(
-                "Updated version: "
-                + _format_booking_summary(updated)
-                + " How does that look now? If you’re happy with it, just say "
-                  "'yes' or anything similar; otherwise tell me what to tweak."
+                "Here’s what I’ve put together: "
+                + _format_booking_summary(payload)
+                + " Happy with that?"
+                  " If not, tell me what to change."
             )
             session.awaiting_confirmation = True
-            continue
-
-        # All fields present, ask for confirmation
-        payload = session.payload()
-        _agent_print(
-            "Here’s what I’ve put together: "
-            + _format_booking_summary(payload)
-            + " Happy with that?"
-              " If not, tell me what to change."
-        )
-        session.awaiting_confirmation = True
+
+    finally:
+        if browser_warmup is not None:
+            await _shutdown_prewarmed(browser_warmup)
 
 
 if __name__ == "__main__":
     chat_loop()
 
 
-__all__ = ["booking_agent", "booking_agent_to_file", "chat_loop", "EXAMPLE_BOOKING_PATH"]
+__all__ = [
+    "booking_agent",
+    "booking_agent_async",
+    "booking_agent_to_file",
+    "chat_loop",
+    "chat_loop_async",
+    "EXAMPLE_BOOKING_PATH",
+]
@@ -1,82 +1,226 @@
 import asyncio
 import json
+import logging
 import os
-from functools import lru_cache
+import sys
+import time
+from contextlib import asynccontextmanager
+from functools import cache
 from pathlib import Path
-from typing import Any, Awaitable, Callable, Optional
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Literal,
+    Mapping,
+    NamedTuple,
+    Optional,
+)
 from urllib.parse import urlsplit
 
-from playwright.async_api import Page, async_playwright
+try:  # Optional speedup; falls back to the stdlib json module.
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+from playwright.async_api import (
+    Browser,
+    BrowserContext,
+    ElementHandle,
+    Locator,
+    Page,
+    Playwright,
+    Route,
+    async_playwright,
+)
+
+from app.console import read_line
+from app.envfile import load_env_file
+
+log = logging.getLogger(__name__)
 
 LOGIN_URL = "https://library.unimelb.edu.au/services/book-a-room-or-computer"
+EXPECTED_HOST = urlsplit(LOGIN_URL).netloc
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 EXAMPLE_BOOKING_PATH = PROJECT_ROOT / "example_booking.json"
 STORAGE_STATE_PATH = PROJECT_ROOT / "storage_state.json"
 
+# Chromium features the booking flow never touches; skipping them trims
+# startup time and memory, which matters most for headless runs.
+CHROMIUM_ARGS = (
+    "--disable-extensions",
+    "--disable-translate",
+    "--disable-sync",
+    "--disable-background-networking",
+    "--disable-default-apps",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-features=Translate,BackForwardCache",
+    # /dev/shm is tiny in containers/CI; GPU compositing is wasted headless.
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+)
+
+# The flow only reads text and form controls, so headless runs skip the
+# heavyweight assets and third-party trackers entirely.
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+BLOCKED_HOST_SUFFIXES = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "hotjar.com",
+    "facebook.net",
+    "segment.io",
+    "segment.com",
+)
+
+
+# Selectors that never change between bookings.
+ROOM_ROWS_SELECTOR = (
+    'tbody[data-bind="foreach: { data: listRoomResults, afterRender: bindMatchTooltips }"]'
+    " tr[data-recordtype='1']"
+)
+ADD_TO_CART_SELECTOR = "td.action-button-column a.add-to-cart"
+ADD_TO_CART_ICON_SELECTOR = "i.fa-plus-circle"
+BOOKING_DATE_SELECTOR = "#booking-date input"
+# Matched with get_by_label (aria-label, <label> or aria-labelledby, substring).
+START_TIME_LABEL = "StartTime Required."
+END_TIME_LABEL = "EndTime Required."
+FOOTER_LINK_SELECTOR = "a.link-footer[href*='RoomRequest.aspx']"
+SIDEBAR_LINK_SELECTOR = "a#sidebar-wrapper-home"
+OKTA_PUSH_SELECTOR = 'div.authenticator-button[data-se="okta_verify-push"] a[data-se="button"]'
+
 
 def load_env() -> None:
     """Lightweight .env loader without external deps."""
 
-    env_path = PROJECT_ROOT / ".env"
-    if not env_path.exists():
-        return
-    for line in env_path.read_text().splitlines():
-        line = line.strip()
-        if not line or line.startswith("#") or "=" not in line:
-            continue
-        key, _, value = line.partition("=")
-        os.environ.setdefault(key.strip(), value.strip())
+    # Applied once per process, so book_once can call it on every booking.
+    load_env_file(PROJECT_ROOT / ".env")
 
 
-@lru_cache(maxsize=1)
-def _booking_data() -> dict[str, Any]:
-    """Read example_booking.json once and cache it for repeated lookups."""
+def _load_booking() -> Mapping[str, Any]:
+    """Read example_booking.json, or an empty mapping if it is missing/broken."""
     try:
-        return json.loads(EXAMPLE_BOOKING_PATH.read_text())
-    except Exception:
-        # If the fixture is missing, fall back to empty defaults.
+        raw = EXAMPLE_BOOKING_PATH.read_bytes()
+    except OSError:
+        # No (readable) fixture: every getter falls back to its default.
+        return {}
+    try:
+        data = orjson.loads(raw) if orjson else json.loads(raw)
+    except ValueError:
         return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _booking_str(data: Mapping[str, Any], key: str) -> str:
+    value = data.get(key)
+    return str(value).strip() if value is not None else ""
+
+
+def _booking_int(data: Mapping[str, Any], key: str) -> Optional[int]:
+    value = data.get(key)
+    # The usual case is a JSON int; only numeric strings need converting.
+    # bool is an int subclass, but a JSON true/false is not a count.
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        text = value.strip()
+        if text.lstrip("-").isdigit():
+            return int(text)
+    return None
+
+
+class BookingConfig(NamedTuple):
+    """Booking fields normalized once; empty/None means "use the getter default"."""
+
+    space: str
+    preferred_library: str
+    min_capacity: Optional[int]
+    date: str
+    start_time: str
+    end_time: str
+    event_name: str
+
+
+def _booking_config(data: Mapping[str, Any]) -> BookingConfig:
+    return BookingConfig(
+        space=_booking_str(data, "space"),
+        preferred_library=_booking_str(data, "preferred_library"),
+        min_capacity=_booking_int(data, "min_capacity"),
+        date=_booking_str(data, "date"),
+        start_time=_booking_str(data, "start_time"),
+        end_time=_booking_str(data, "end_time"),
+        event_name=_booking_str(data, "event_name"),
+    )
 
 
-def _booking_str(key: str, default: str) -> str:
-    value = _booking_data().get(key, default)
-    return (str(value).strip() or default) if value is not None else default
+# Built once at import; set_booking_data()/reload_booking_data() swap it out.
+_BOOKING_CFG = _booking_config(_load_booking())
 
 
-def _booking_int(key: str, default: int) -> int:
-    try:
-        value = _booking_data().get(key, default)
-        return int(value)
-    except Exception:
-        return default
+def set_booking_data(payload: Mapping[str, Any]) -> None:
+    """Use ``payload`` (example_booking.json keys) for the following getters."""
+
+    global _BOOKING_CFG
+    _BOOKING_CFG = _booking_config(payload)
+
+
+def reload_booking_data() -> None:
+    """Re-read the JSON file and rebuild the booking config from it."""
+
+    set_booking_data(_load_booking())
 
 
 def get_space_label(default: str = "Book a Space in a Library") -> str:
-    return _booking_str("space", default)
+    return _BOOKING_CFG.space or default
 
 
 def get_booking_date(default: str = "") -> str:
-    return _booking_str("date", default)
+    return _BOOKING_CFG.date or default
 
 
 def get_booking_start_time(default: str = "") -> str:
-    return _booking_str("start_time", default)
+    return _BOOKING_CFG.start_time or default
 
 
 def get_booking_end_time(default: str = "") -> str:
-    return _booking_str("end_time", default)
+    return _BOOKING_CFG.end_time or default
 
 
 def get_preferred_library(default: str = "") -> str:
-    return _booking_str("preferred_library", default)
+    return _BOOKING_CFG.preferred_library or default
 
 
 def get_min_capacity(default: int = 0) -> int:
-    return _booking_int("min_capacity", default)
+    capacity = _BOOKING_CFG.min_capacity
+    return default if capacity is None else capacity
 
 
 def get_event_name(default: str = "") -> str:
-    return _booking_str("event_name", default)
+    return _BOOKING_CFG.event_name or default
+
+
+# Index of the first result row whose building matches (case-insensitive) and
+# whose capacity is large enough, or -1. Runs entirely in the page, so the
+# whole filter is a single round-trip.
+_MATCH_ROW_JS = """
+(rows, { library, minCapacity }) => rows.findIndex(row => {
+    const building = row.querySelector("a[data-bind*='BuildingDescription']");
+    const capacity = row.querySelector("td[tabindex='0'][data-bind='text: Capacity']");
+    const buildingText = building ? building.innerText.trim().toLowerCase() : "";
+    const capacityValue = parseInt(capacity ? capacity.innerText.trim() : "", 10) || 0;
+    return (!library || buildingText === library) && capacityValue >= minCapacity;
+})
+"""
+
+
+async def _find_matching_row_index(rows: Locator, preferred_lower: str, min_capacity: int) -> int:
+    """Run the row filter in the page and return the winning index (or -1)."""
+
+    return await rows.evaluate_all(
+        _MATCH_ROW_JS, {"library": preferred_lower, "minCapacity": min_capacity}
+    )
 
 
 async def set_attendees_to_min_capacity(page: Page) -> None:
@@ -85,12 +229,9 @@ async def set_attendees_to_min_capacity(page: Page) -> None:
     min_capacity = get_min_capacity()
     try:
         attendees_input = page.get_by_role("spinbutton", name="Number of Attendees")
-        await attendees_input.wait_for(state="visible", timeout=5000)
-        await attendees_input.click()
-        await attendees_input.fill("")
-        await attendees_input.type(str(min_capacity), delay=20)
+        await attendees_input.fill(str(min_capacity), timeout=5000)
     except Exception as exc:
-        print(f"Could not set Number of Attendees: {exc}")
+        log.warning("Could not set Number of Attendees: %s", exc)
 
 
 async def select_first_room(page: Page) -> None:
@@ -99,323 +240,588 @@ async def select_first_room(page: Page) -> None:
     preferred_library = get_preferred_library()
     min_capacity = get_min_capacity()
 
-    tbody_selector = (
-        'tbody[data-bind="foreach: { data: listRoomResults, afterRender: bindMatchTooltips }"]'
-    )
-    result_rows = page.locator(f"{tbody_selector} tr[data-recordtype='1']")
+    result_rows = page.locator(ROOM_ROWS_SELECTOR)
     first_row = result_rows.first
     await first_row.wait_for(state="visible", timeout=5000)
 
+    # Without a library or capacity filter the first row is the answer; skip
+    # the in-page scan entirely.
     target_row = first_row
     if preferred_library or min_capacity > 0:
-        row_count = await result_rows.count()
-        preferred_lower = preferred_library.strip().lower()
-        matched = False
-        for idx in range(row_count):
-            candidate = result_rows.nth(idx)
-
-            building_locator = candidate.locator("a[data-bind*='BuildingDescription']").first
-            building = ""
-            try:
-                building = (await building_locator.inner_text()).strip()
-            except Exception:
-                building = ""
-
-            capacity_cell = candidate.locator("td[tabindex='0'][data-bind='text: Capacity']").first
-            capacity_value = 0
-            try:
-                capacity_text = (await capacity_cell.inner_text()).strip()
-                capacity_value = int(capacity_text or 0)
-            except Exception:
-                capacity_value = 0
-
-            library_ok = not preferred_library or building.lower() == preferred_lower
-            capacity_ok = capacity_value >= min_capacity
-
-            if library_ok and capacity_ok:
-                target_row = candidate
-                matched = True
-                break
-
-        if not matched:
-            # No exact match; just take the first available option.
-            pass
-
-    await target_row.scroll_into_view_if_needed()
+        match_idx = await _find_matching_row_index(
+            result_rows, preferred_library.strip().lower(), min_capacity
+        )
+        # No match (-1): just take the first available option.
+        if match_idx >= 0:
+            target_row = result_rows.nth(match_idx)
 
-    description_locator = target_row.locator("a[data-bind*='RoomDescription']").first
-    description = ""
-    try:
-        description = (await description_locator.inner_text()).strip()
-    except Exception:
-        description = ""
-    add_to_cart = target_row.locator("td.action-button-column a.add-to-cart").first
-    icon = add_to_cart.locator("i.fa-plus-circle").first
-    await add_to_cart.wait_for(state="visible", timeout=10_000)
+    add_to_cart = target_row.locator(ADD_TO_CART_SELECTOR).first
+    icon = add_to_cart.locator(ADD_TO_CART_ICON_SELECTOR).first
+    # The plus icon renders last; once it is visible the button is usable.
     await icon.wait_for(state="visible", timeout=10_000)
-    await add_to_cart.scroll_into_view_if_needed()
-
-    await add_to_cart.click()
+    await add_to_cart.click(timeout=10_000)
 
 
 async def add_space_and_next_step(page: Page) -> None:
     """Click Add Space and proceed to Next Step."""
 
+    add_space_btn = page.get_by_role("button", name="Add Space")
     try:
-        add_space_btn = page.get_by_role("button", name="Add Space")
-        await add_space_btn.wait_for(state="visible", timeout=10_000)
-        await add_space_btn.scroll_into_view_if_needed()
-        await add_space_btn.click()
+        await add_space_btn.click(timeout=10_000)
     except Exception as exc:
-        print(f"Could not click Add Space: {exc}")
+        log.warning("Could not click Add Space: %s", exc)
 
-    # Small pause to let the UI update before proceeding.
-    await page.wait_for_timeout(5000)
+    # Proceed as soon as the Add Space control goes away instead of sleeping;
+    # capped at the 5s the fixed pause used to cost.
+    try:
+        await add_space_btn.wait_for(state="hidden", timeout=5000)
+    except Exception:
+        pass
 
     try:
         next_step_btn = page.get_by_role("button", name="Next Step")
-        await next_step_btn.wait_for(state="visible", timeout=10_000)
-        await next_step_btn.scroll_into_view_if_needed()
-        await next_step_btn.click()
+        await next_step_btn.click(timeout=10_000)
     except Exception as exc:
-        print(f"Could not click Next Step: {exc}")
+        log.warning("Could not click Next Step: %s", exc)
 
 
-async def fill_event_and_submit(page: Page) -> None:
-    """Fill event details, accept terms, and create the reservation."""
+async def fill_event_and_submit(page: Page) -> bool:
+    """Fill event details, accept terms, and create the reservation.
 
-    # Event name textbox
-    event_name = get_event_name()
+    Returns whether the Create Reservation button was clicked.
+    """
+
+    # Event name textbox. Filled before the terms click: a click moves focus
+    # off the textbox, so running the two together can drop the typed value.
     try:
         event_input = page.get_by_role("textbox", name="Event Name * Event Name *")
-        await event_input.wait_for(state="visible", timeout=5000)
-        await event_input.scroll_into_view_if_needed()
-        await event_input.click()
-        await event_input.fill("")
-        await event_input.type(event_name, delay=20)
+        await event_input.fill(get_event_name(), timeout=5000)
     except Exception as exc:
-        print(f"Could not fill event name: {exc}")
+        log.warning("Could not fill event name: %s", exc)
 
     # Terms and conditions checkbox (via label click)
     try:
         terms_label = page.locator("label").filter(
             has_text="I have read and agree to the Terms and Conditions"
         ).first
-        await terms_label.wait_for(state="visible", timeout=5000)
-        await terms_label.scroll_into_view_if_needed()
-        await terms_label.click()
+        await terms_label.click(timeout=5000)
     except Exception as exc:
-        print(f"Could not check Terms and Conditions: {exc}")
+        log.warning("Could not check Terms and Conditions: %s", exc)
 
     # Create Reservation
     try:
         create_btn = page.locator("#details").get_by_role("button", name="Create Reservation")
-        await create_btn.wait_for(state="visible", timeout=5000)
-        await create_btn.scroll_into_view_if_needed()
-        await create_btn.click()
-        print("Room booked.")
+        await create_btn.click(timeout=5000)
     except Exception as exc:
-        print(f"Could not click Create Reservation: {exc}")
+        log.warning("Could not click Create Reservation: %s", exc)
+        return False
+    log.info("Room booked.")
+    return True
+
+
+# Set the date/start/end inputs and fire the input/change events Knockout
+# listens for, all in one round-trip.
+_SET_DATE_TIME_JS = """
+fields => {
+    for (const [el, value] of fields) {
+        el.value = value;
+        el.dispatchEvent(new Event('input', { bubbles: true }));
+        el.dispatchEvent(new Event('change', { bubbles: true }));
+    }
+}
+"""
+
+
+async def _visible_handle(field: Locator) -> ElementHandle:
+    await field.wait_for(state="visible", timeout=5000)
+    return await field.element_handle()
+
+
+async def _fill_date_and_times(page: Page) -> None:
+    """Fill date, start and end time in a single page.evaluate; skip empty values.
+
+    Each input is waited for on its own, so one that never shows up is
+    reported and skipped without holding back the others. Filled inputs then
+    get an Enter press, which is what makes the pickers commit the value.
+    """
+
+    fields = [
+        ("date", page.locator(BOOKING_DATE_SELECTOR).first, get_booking_date()),
+        ("start time", page.get_by_label(START_TIME_LABEL).first, get_booking_start_time()),
+        ("end time", page.get_by_label(END_TIME_LABEL).first, get_booking_end_time()),
+    ]
+    fields = [field for field in fields if field[2]]
+    handles = await asyncio.gather(
+        *(_visible_handle(locator) for _, locator, _ in fields), return_exceptions=True
+    )
+    found = []
+    for (description, locator, value), handle in zip(fields, handles):
+        if isinstance(handle, BaseException):
+            log.warning("Could not fill %s: %s", description, handle)
+        else:
+            found.append((description, locator, value, handle))
+    if not found:
+        return
+    try:
+        await page.evaluate(
+            _SET_DATE_TIME_JS, [[handle, value] for _, _, value, handle in found]
+        )
+    except Exception as exc:
+        log.warning("Could not fill date/time: %s", exc)
+        return
+    for description, locator, _, _ in found:
+        try:
+            await locator.press("Enter")
+        except Exception as exc:
+            log.warning("Could not commit %s: %s", description, exc)
 
 
-async def run_login_probe(
-    *,
-    slow_mo_ms: int = 400,
-    headless: bool = False,
-    post_login: Optional[Callable[[Page], Awaitable[None]]] = None,
-    pause_before_close: bool = True,
-) -> None:
-    """Open the booking site, log in, then optionally run extra steps."""
+async def _block_nonessential(route: Route) -> None:
+    request = route.request
+    host = urlsplit(request.url).hostname or ""
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or host.endswith(
+        BLOCKED_HOST_SUFFIXES
+    ):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+@cache
+def _has_storage() -> bool:
+    """Whether a saved session exists; cleared whenever save_session writes one."""
+
+    return STORAGE_STATE_PATH.exists()
+
+
+VIEWPORT = {"width": 1280, "height": 900}
+
+
+async def _new_context(browser: Browser) -> BrowserContext:
+    """New context seeded with the saved session, if there is one."""
+
+    storage_state = str(STORAGE_STATE_PATH) if _has_storage() else None
+    return await browser.new_context(storage_state=storage_state, viewport=VIEWPORT)
+
+
+async def _session_page(context: BrowserContext, *, headless: bool) -> Page:
+    """Apply request blocking and timeouts, and return the page to drive."""
+
+    # Keep the full page when a human is watching (headed/debug runs).
+    if headless:
+        await context.route("**/*", _block_nonessential)
+    # A persistent context starts with a blank tab; use it rather than a second one.
+    page = context.pages[0] if context.pages else await context.new_page()
+    # Fail fast on missing controls; steps that genuinely need longer (the
+    # 2FA push) pass their own timeout.
+    page.set_default_timeout(10_000)
+    page.set_default_navigation_timeout(15_000)
+    return page
+
+
+# Last storage state written by save_session, to skip identical rewrites.
+_SAVED_STATE: Optional[bytes] = None
+
+
+async def save_session(page: Page) -> None:
+    """Persist cookies/local storage so later runs can skip the login."""
+
+    global _SAVED_STATE
+    try:
+        data = await page.context.storage_state()
+        state = orjson.dumps(data) if orjson else json.dumps(data).encode()
+        if state == _SAVED_STATE:
+            return
+        STORAGE_STATE_PATH.write_bytes(state)
+        _SAVED_STATE = state
+        _has_storage.cache_clear()
+    except Exception as exc:
+        log.warning("Could not save storage state: %s", exc)
+
+
+async def _dbg_shot(page: Page, name: str) -> None:
+    """Best-effort viewport screenshot for failure paths."""
+
+    try:
+        await page.screenshot(path=name)
+    except Exception:
+        pass
+
+
+def _phase_timer() -> Callable[[str], None]:
+    """Return ``mark(name)``, logging the time since the previous mark.
+
+    Only active with BOOKING_PROFILE=1; otherwise ``mark`` is a no-op.
+    """
+
+    if os.getenv("BOOKING_PROFILE") != "1":
+        return lambda name: None
+    last = time.perf_counter()
+
+    def mark(name: str) -> None:
+        nonlocal last
+        now = time.perf_counter()
+        log.info("[phase] %s %.0fms", name, (now - last) * 1000)
+        last = now
+
+    return mark
+
+
+# Reservation landing page reached in this process; warm runs jump straight
+# back to it instead of going through the library site and SSO again.
+_LANDING_URL: Optional[str] = None
+
+
+async def _resume_landing(page: Page, space_tile: Locator) -> bool:
+    """Go straight to the remembered landing page; True if the session still works."""
+
+    if _LANDING_URL is None or not _has_storage():
+        return False
+    try:
+        await page.goto(_LANDING_URL, wait_until="domcontentloaded")
+        # An expired session redirects to the Okta login instead.
+        await space_tile.or_(page.get_by_role("textbox", name="Username")).first.wait_for(
+            state="visible", timeout=10_000
+        )
+        return await space_tile.is_visible()
+    except Exception:
+        return False
+
+
+async def _reach_landing(page: Page, mark: Callable[[str], None]) -> bool:
+    """Walk from the library site through DiBS (and SSO if needed) to the landing page."""
 
-    load_env()
     username = os.getenv("DIBS_USERNAME", "")
     password = os.getenv("DIBS_PASSWORD", "")
 
-    space_label = get_space_label()
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=headless, slow_mo=slow_mo_ms)
-        storage_state = str(STORAGE_STATE_PATH) if STORAGE_STATE_PATH.exists() else None
-        context = await browser.new_context(
-            storage_state=storage_state,
-            viewport={"width": 1280, "height": 900},
-        )
-        page = await context.new_page()
-        page.set_default_timeout(30_000)
-        reached_landing = False
+    # No networkidle waits anywhere: analytics beacons keep the network busy
+    # long after the UI is usable. Each step waits on the element it needs.
+    await page.goto(LOGIN_URL, wait_until="domcontentloaded")
+    # Optional: check we're on the right host BEFORE clicking
+    current_host = urlsplit(page.url).netloc
+    if current_host != EXPECTED_HOST:
+        raise RuntimeError(f"Unexpected host {current_host!r}, expected {EXPECTED_HOST!r}")
 
-        await page.goto(LOGIN_URL, wait_until="domcontentloaded")
-        await page.wait_for_load_state("networkidle")
-        if headless:
-            try:
-                await page.screenshot(path="headless-pre-dibs.png", full_page=True)
-            except Exception as exc:
-                print(f"Could not take pre-click screenshot: {exc}")
+    # Click the DiBS button (more patiently for headless)
+    try:
+        dibs_link = page.get_by_role("link", name="Book a room - DiBS")
+        await dibs_link.click(timeout=15_000)
+    except Exception as exc:
+        log.warning("Could not click 'Book a room - DiBS': %s", exc)
+        await _dbg_shot(page, "headless-fail-dibs.png")
+        return False
+    await page.wait_for_load_state("domcontentloaded")
+    mark("navigate")
+    # Wait for whichever shows up first: the login prompt or, with a saved
+    # session, the reservation links, rather than a fixed 1s pause.
+    username_box = page.get_by_role("textbox", name="Username")
+    try:
+        await username_box.or_(
+            page.locator(f"{FOOTER_LINK_SELECTOR}, {SIDEBAR_LINK_SELECTOR}")
+        ).first.wait_for(state="visible", timeout=10_000)
+    except Exception:
+        pass
 
-        # Optional: check we're on the right host BEFORE clicking
-        current = page.url
-        expected_host = urlsplit(LOGIN_URL).netloc
-        assert urlsplit(current).netloc == expected_host
+    login_prompt_visible = False
+    try:
+        login_prompt_visible = await username_box.is_visible()
+    except Exception:
+        login_prompt_visible = False
 
-        # Click the DiBS button (more patiently for headless)
+    if username and login_prompt_visible:
         try:
-            await page.wait_for_load_state("networkidle")
-            dibs_link = page.get_by_role("link", name="Book a room - DiBS")
-            await dibs_link.wait_for(state="visible", timeout=15_000)
-            await dibs_link.scroll_into_view_if_needed()
-            await dibs_link.click()
+            await username_box.fill(username)
+            await page.get_by_role("button", name="Next").click()
+            if password:
+                await page.get_by_role("textbox", name="Password").fill(password)
+                await page.get_by_role("button", name="Verify").click()
+                log.info("Awaiting 2FA on phone...")
+                try:
+                    # Click the Okta Verify push option explicitly
+                    push_button = page.locator(OKTA_PUSH_SELECTOR)
+                    await push_button.click(timeout=30_000)
+                except Exception as exc:
+                    log.warning("Could not click the second 'Select' button: %s", exc)
         except Exception as exc:
-            print(f"Could not click 'Book a room - DiBS': {exc}")
-            try:
-                await page.screenshot(path="headless-fail-dibs.png", full_page=True)
-            except Exception:
-                pass
-            await browser.close()
-            return
-        await page.wait_for_load_state("networkidle")
-        await page.wait_for_timeout(1000)
+            log.warning("Could not auto-fill username: %s", exc)
+    elif not login_prompt_visible:
+        pass
+    mark("login")
 
-        login_prompt_visible = False
-        try:
-            login_prompt_visible = await page.get_by_role("textbox", name="Username").is_visible()
-        except Exception:
-            login_prompt_visible = False
+    # Proceed into the booking flow landing page via the footer or sidebar
+    # reservation link (whichever comes first in the DOM); one wait covers both.
+    try:
+        reservation_link = page.locator(FOOTER_LINK_SELECTOR).or_(
+            page.locator(SIDEBAR_LINK_SELECTOR)
+        )
+        await reservation_link.first.click(timeout=10_000)
+    except Exception as exc:
+        log.warning("Could not click 'Create A Reservation': %s", exc)
+    await page.wait_for_load_state("domcontentloaded")
+    mark("landing")
 
-        if username and login_prompt_visible:
-            try:
-                await page.get_by_role("textbox", name="Username").fill(username)
-                await page.get_by_role("button", name="Next").click()
-                if password:
-                    await page.get_by_role("textbox", name="Password").fill(password)
-                    await page.get_by_role("button", name="Verify").click()
-                    print("Awaiting 2FA on phone...")
-                    try:
-                        # Click the Okta Verify push option explicitly
-                        push_button = page.locator(
-                            'div.authenticator-button[data-se="okta_verify-push"] a[data-se="button"]'
-                        )
-                        await push_button.wait_for(state="visible")
-                        await push_button.click()
-                    except Exception as exc:
-                        print(f"Could not click the second 'Select' button: {exc}")
-            except Exception as exc:
-                print(f"Could not auto-fill username: {exc}")
-        elif not login_prompt_visible:
-            pass
+    return True
 
-        # Proceed into the booking flow landing page (footer link)
-        try:
-            footer_link = page.locator("a.link-footer[href*='RoomRequest.aspx']")
-            await footer_link.wait_for(state="visible", timeout=5000)
-            await footer_link.scroll_into_view_if_needed()
-            await footer_link.click()
-        except Exception:
-            try:
-                # Fallback: sidebar link id if footer not present
-                await page.wait_for_selector("a#sidebar-wrapper-home", timeout=5000)
-                link = page.locator("a#sidebar-wrapper-home")
-                await link.scroll_into_view_if_needed()
-                await link.click()
-            except Exception as exc:
-                print(f"Could not click 'Create A Reservation': {exc}")
-        await page.wait_for_load_state("networkidle")
-        reached_landing = True
 
-        # After the reservation landing page loads, click the configured space tile,
-        # then click the specific "book now" button shown in the inspected markup.
-        try:
-            await page.wait_for_load_state("networkidle")
-            book_space_tile = page.get_by_text(space_label, exact=True)
-            await book_space_tile.wait_for(state="visible", timeout=5000)
-            await book_space_tile.scroll_into_view_if_needed()
-            await book_space_tile.click()
-
-            # Button aria-label pattern: Book Now With The "<space_label>" Template
-            book_now_button = page.get_by_role(
-                "button",
-                name=f'Book Now With The "{space_label}" Template',
-            )
-            await book_now_button.wait_for(state="visible", timeout=5000)
-            await book_now_button.scroll_into_view_if_needed()
-            await book_now_button.click()
+async def book_once(page: Page) -> Optional[bool]:
+    """Log in if needed, then search and reserve using the current booking data.
 
-            # Fill the date field using the booking-date container locator.
-            booking_date = get_booking_date()
-            if booking_date:
-                try:
-                    date_input = page.locator("#booking-date input").first
-                    await date_input.wait_for(state="visible", timeout=5000)
-                    await date_input.click()
-                    await date_input.fill("")
-                    await date_input.type(booking_date, delay=20)
-                    await date_input.press("Enter")
-                except Exception as exc:
-                    print(f"Could not fill date via #booking-date input: {exc}")
+    Returns True once Create Reservation was clicked, False if the flow reached
+    the reservation landing page but a later step failed, and None if the
+    DiBS entry link never showed up. The page can be reused for further
+    bookings, which skips the Chromium launch and, while the session is live,
+    the login prompt and the trip through the library site.
+    """
 
-            # Fill start time
-            start_time = get_booking_start_time()
-            if start_time:
-                try:
-                    start_input = page.get_by_label("StartTime Required.")
-                    await start_input.wait_for(state="visible", timeout=5000)
-                    await start_input.click()
-                    await start_input.fill("")
-                    await start_input.type(start_time, delay=20)
-                    await start_input.press("Enter")
-                except Exception as exc:
-                    print(f"Could not fill start time: {exc}")
+    global _LANDING_URL
+    load_env()
+    space_label = get_space_label()
+    mark = _phase_timer()
+    book_space_tile = page.get_by_text(space_label, exact=True)
+    booked = False
 
-            # Fill end time
-            end_time = get_booking_end_time()
-            if end_time:
-                try:
-                    end_input = page.get_by_label("EndTime Required.")
-                    await end_input.wait_for(state="visible", timeout=5000)
-                    await end_input.click()
-                    await end_input.fill("")
-                    await end_input.type(end_time, delay=20)
-                    await end_input.press("Enter")
-                except Exception as exc:
-                    print(f"Could not fill end time: {exc}")
+    if await _resume_landing(page, book_space_tile):
+        mark("resume")
+    elif not await _reach_landing(page, mark):
+        return None
+
+    # After the reservation landing page loads, click the configured space tile,
+    # then click the specific "book now" button shown in the inspected markup.
+    try:
+        await book_space_tile.wait_for(state="visible", timeout=10_000)
+        _LANDING_URL = page.url
+
+        # Button aria-label pattern: Book Now With The "<space_label>" Template
+        book_now_button = page.get_by_role(
+            "button",
+            name=f'Book Now With The "{space_label}" Template',
+        )
+        # Start watching for the button while the tile click is still settling.
+        await asyncio.gather(
+            book_space_tile.click(),
+            book_now_button.wait_for(state="visible", timeout=5000),
+        )
+        await book_now_button.click()
+
+        await _fill_date_and_times(page)
 
-            # Click Search within Date & Time group
+        # Click Search within Date & Time group
+        try:
+            search_button = page.get_by_label("Date & Time").get_by_role("button", name="Search")
+            await search_button.click(timeout=5000)
+            mark("fill_form")
             try:
-                search_button = page.get_by_label("Date & Time").get_by_role("button", name="Search")
-                await search_button.wait_for(state="visible", timeout=5000)
-                await search_button.click()
-                try:
-                    await select_first_room(page)
-                    await set_attendees_to_min_capacity(page)
-                    await add_space_and_next_step(page)
-                    await fill_event_and_submit(page)
-                except Exception as exc:
-                    print(f"Could not select first room: {exc}")
+                await select_first_room(page)
+                mark("select_room")
+                await set_attendees_to_min_capacity(page)
+                await add_space_and_next_step(page)
+                booked = await fill_event_and_submit(page)
+                mark("submit")
             except Exception as exc:
-                print(f"Could not click Search button: {exc}")
+                log.warning("Could not select first room: %s", exc)
         except Exception as exc:
-            print(f"Could not click space '{space_label}' / book-now button: {exc}")
+            log.warning("Could not click Search button: %s", exc)
+    except Exception as exc:
+        log.warning("Could not click space '%s' / book-now button: %s", space_label, exc)
+
+    return booked
+
+
+async def _wait_for_enter_or_close(page: Page) -> None:
+    """Return when Enter is pressed or the user closes the browser window."""
+
+    waiters = {
+        asyncio.ensure_future(read_line()),
+        asyncio.ensure_future(page.wait_for_event("close", timeout=0)),
+    }
+    _, pending = await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+    for waiter in pending:
+        waiter.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+
+
+class BrowserPool:
+    """One Playwright driver and Chromium process shared across bookings.
+
+    Chromium is launched lazily on first use and kept warm; each ``session()``
+    gets its own context (seeded from storage_state.json) and closes only that
+    context. With ``user_data_dir`` the profile (cookies, HTTP cache) lives on
+    disk in a persistent context instead; a profile can only back one context,
+    so its sessions share that context's page and leave it open. Call
+    ``shutdown()`` (or use the pool as an ``async with`` block) when done.
+    """
+
+    def __init__(
+        self,
+        *,
+        headless: bool = True,
+        slow_mo_ms: int = 0,
+        user_data_dir: Optional[Path] = None,
+    ) -> None:
+        self.headless = headless
+        self.slow_mo_ms = slow_mo_ms
+        self.user_data_dir = user_data_dir
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._persistent_page: Optional[Page] = None
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self) -> "BrowserPool":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.shutdown()
+
+    async def _driver(self) -> Playwright:
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        return self._playwright
+
+    async def get(self) -> Browser:
+        """Return the shared browser, launching (or relaunching) it if needed."""
+
+        if self.user_data_dir is not None:
+            raise ValueError("a pool with user_data_dir has no shared browser; use session()")
+        async with self._lock:
+            if self._browser is None or not self._browser.is_connected():
+                self._browser = await (await self._driver()).chromium.launch(
+                    headless=self.headless, slow_mo=self.slow_mo_ms, args=list(CHROMIUM_ARGS)
+                )
+            return self._browser
+
+    async def _persistent(self) -> Page:
+        async with self._lock:
+            if self._persistent_page is None or self._persistent_page.is_closed():
+                context = await (await self._driver()).chromium.launch_persistent_context(
+                    str(self.user_data_dir),
+                    headless=self.headless,
+                    slow_mo=self.slow_mo_ms,
+                    args=list(CHROMIUM_ARGS),
+                    viewport=VIEWPORT,
+                )
+                self._persistent_page = await _session_page(context, headless=self.headless)
+            return self._persistent_page
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[Page]:
+        if self.user_data_dir is not None:
+            yield await self._persistent()
+            return
+        context = await _new_context(await self.get())
+        try:
+            yield await _session_page(context, headless=self.headless)
+        finally:
+            await context.close()
 
-        if post_login:
-            await post_login(page)
+    async def shutdown(self) -> None:
+        async with self._lock:
+            if self._persistent_page is not None:
+                await self._persistent_page.context.close()
+                self._persistent_page = None
+            if self._browser is not None:
+                await self._browser.close()
+                self._browser = None
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
 
-        # Keep the browser open until YOU decide to close it
-        if pause_before_close:
-            # Leave the browser open so a human can poke around before exit.
-            print("Browser is open. Do your thing, then press Enter in the terminal to close it...")
-            input()  # blocks until you press Enter
 
-        if reached_landing:
-            try:
-                await page.context.storage_state(path=str(STORAGE_STATE_PATH))
-            except Exception as exc:
-                print(f"Could not save storage state: {exc}")
+# Shared warm browser for long-running callers (e.g. the API server).
+BROWSER_POOL = BrowserPool()
 
-        await browser.close()
+
+async def run_login_probe(
+    *,
+    slow_mo_ms: Optional[int] = None,
+    headless: Optional[bool] = None,
+    post_login: Optional[Callable[[Page], Awaitable[None]]] = None,
+    pause_before_close: Literal["tty", "never"] = "tty",
+    user_data_dir: Optional[Path] = None,
+    page: Optional[Page] = None,
+    debug: bool = False,
+    pool: Optional[BrowserPool] = None,
+) -> None:
+    """Open the booking site, log in, then optionally run extra steps.
+
+    By default this launches its own ``BrowserPool`` (headless, no slow-mo)
+    and shuts it down afterwards. ``slow_mo_ms`` is off by default; pass e.g.
+    400 to watch the flow step by step, or set ``debug=True`` for the same.
+    ``user_data_dir`` switches to a persistent Chromium profile (see
+    ``BrowserPool``). ``pause_before_close`` picks how to wait before
+    closing: ``"tty"`` waits for Enter when stdin is a terminal and
+    ``"never"`` closes straight away.
+
+    Pass ``pool`` to run on a fresh session of an existing warm pool, or
+    ``page`` (e.g. from ``pool.session()``) to reuse that page; it is left
+    open afterwards. Launch options belong to whoever owns the browser, so
+    combining either with ``headless``/``slow_mo_ms``/``debug``/
+    ``user_data_dir`` raises ValueError.
+    """
+
+    if page is not None or pool is not None:
+        if page is not None and pool is not None:
+            raise ValueError("pass either page or pool, not both")
+        launch_options = {
+            "headless": headless is not None,
+            "slow_mo_ms": slow_mo_ms is not None,
+            "debug": debug,
+            "user_data_dir": user_data_dir is not None,
+        }
+        conflicting = [name for name, given in launch_options.items() if given]
+        if conflicting:
+            raise ValueError(
+                f"{', '.join(conflicting)} cannot be combined with "
+                f"{'page' if page is not None else 'pool'}; configure the browser's owner instead"
+            )
+
+    if page is not None:
+        await _probe(page, post_login, pause_before_close)
+        return
+    if pool is not None:
+        async with pool.session() as page:
+            await _probe(page, post_login, pause_before_close)
+        return
+    own_pool = BrowserPool(
+        headless=True if headless is None else headless,
+        slow_mo_ms=400 if debug else slow_mo_ms or 0,
+        user_data_dir=user_data_dir,
+    )
+    async with own_pool, own_pool.session() as page:
+        await _probe(page, post_login, pause_before_close)
+
+
+async def _probe(
+    page: Page,
+    post_login: Optional[Callable[[Page], Awaitable[None]]],
+    pause_before_close: Literal["tty", "never"],
+) -> None:
+    if await book_once(page) is None:
+        return
+
+    if post_login:
+        await post_login(page)
+
+    # Persist the fresh login before the (possibly long) pause; the save
+    # after it only rewrites the file if the session changed meanwhile.
+    await save_session(page)
+
+    # Keep the browser open until YOU decide to close it
+    if pause_before_close == "tty" and sys.stdin.isatty():
+        # Leave the browser open so a human can poke around before exit.
+        print("Browser is open. Do your thing, then press Enter (or close the window)...")
+        await _wait_for_enter_or_close(page)
+
+    await save_session(page)
 
 
 async def main() -> None:
-    await run_login_probe()
+    load_env()
+    # Running this file directly is for watching the flow, so stay headed.
+    await run_login_probe(headless=False, debug=os.getenv("DIBS_DEBUG") == "1")
 
 
 if __name__ == "__main__":
+    logging.basicConfig(format="%(message)s", stream=sys.stdout)
+    log.setLevel(logging.INFO)
     asyncio.run(main())
 
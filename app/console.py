@@ -0,0 +1,39 @@
+"""Terminal input for code running on an asyncio event loop."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+
+
+async def read_line(prompt: str = "") -> str:
+    """input() for coroutines: read one line from stdin without blocking the loop.
+
+    On a terminal this waits on a loop reader, so no thread is left stuck in
+    input() when Ctrl+C cancels the wait. Pipes and platforms without reader
+    support fall back to input() in the default executor. Raises EOFError at
+    end of input, like input().
+    """
+
+    loop = asyncio.get_running_loop()
+    if sys.stdin.isatty():
+        done: asyncio.Future[str] = loop.create_future()
+        try:
+            loop.add_reader(
+                sys.stdin, lambda: done.done() or done.set_result(sys.stdin.readline())
+            )
+        except (NotImplementedError, OSError, ValueError):
+            pass
+        else:
+            print(prompt, end="", flush=True)
+            try:
+                line = await done
+            finally:
+                loop.remove_reader(sys.stdin)
+            if not line:
+                raise EOFError
+            return line.rstrip("\n")
+    return await loop.run_in_executor(None, input, prompt)
+
+
+__all__ = ["read_line"]
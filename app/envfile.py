@@ -0,0 +1,47 @@
+"""Minimal .env reader shared by the CLI agent and the browser flow."""
+
+from __future__ import annotations
+
+import codecs
+import os
+import re
+from pathlib import Path
+
+# KEY=value per line; blank lines and "#" comments simply don't match.
+# [^\S\n] is "whitespace but not newline" so matches never span lines.
+_ENV_LINE_RE = re.compile(
+    r"^[^\S\n]*([A-Za-z_]\w*)[^\S\n]*=[^\S\n]*(.*?)[^\S\n]*$", re.MULTILINE
+)
+
+# Files already applied in this process.
+_LOADED: set[Path] = set()
+
+
+def _decode(data: bytes) -> str:
+    # Editors on Windows save UTF-16 with a BOM (.env.example is one of them).
+    if data.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return data.decode("utf-16")
+    return data.decode("utf-8-sig")
+
+
+def load_env_file(path: Path) -> None:
+    """Copy KEY=value pairs from ``path`` into os.environ without overriding.
+
+    The first assignment of a repeated key wins. Each file is applied once per
+    process; a file that fails to read or decode raises and is retried on the
+    next call rather than being skipped from then on.
+    """
+
+    if path in _LOADED:
+        return
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        _LOADED.add(path)
+        return
+    pairs = reversed(_ENV_LINE_RE.findall(_decode(data)))
+    os.environ.update({key: value for key, value in pairs if key not in os.environ})
+    _LOADED.add(path)
+
+
+__all__ = ["load_env_file"]
@@ -0,0 +1,53 @@
+"""Library names DiBS accepts, plus the nicknames people actually type."""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Optional
+
+ALLOWED_LIBRARIES = {
+    "fbe building": "FBE Building",
+    "eastern resource centre library": "EASTERN RESOURCE CENTRE LIBRARY",
+    "baillieu library": "Baillieu Library",
+    "southbank the hub": "Southbank The Hub",
+    "werribee learning & teaching building": "Werribee Learning & Teaching Building",
+}
+
+LIBRARY_SYNONYMS = {
+    "fbe": "FBE Building",
+    "business and economics": "FBE Building",
+    "erc": "EASTERN RESOURCE CENTRE LIBRARY",
+    "eastern resource center": "EASTERN RESOURCE CENTRE LIBRARY",
+    "baillieu": "Baillieu Library",
+    "southbank": "Southbank The Hub",
+    "the hub": "Southbank The Hub",
+    "werribee": "Werribee Learning & Teaching Building",
+    "learning and teaching building": "Werribee Learning & Teaching Building",
+}
+
+# Exact hits (canonical names and bare nicknames) resolve with one dict lookup.
+_LIBRARY_LOOKUP = {**ALLOWED_LIBRARIES, **LIBRARY_SYNONYMS}
+# Otherwise all synonyms are matched in one scan; longer keys first so they
+# win at a tie.
+_LIBRARY_SYNONYM_RE = re.compile(
+    "|".join(re.escape(key) for key in sorted(LIBRARY_SYNONYMS, key=len, reverse=True))
+)
+
+
+@lru_cache(maxsize=256)
+def normalize_library(raw: Optional[str]) -> Optional[str]:
+    """Canonical DiBS library label for a name or nickname, or None if unknown."""
+
+    if not raw:
+        return None
+    value = raw.strip().lower()
+    exact = _LIBRARY_LOOKUP.get(value)
+    if exact:
+        return exact
+    # Accept loose nicknames by mapping to the canonical label.
+    match = _LIBRARY_SYNONYM_RE.search(value)
+    return LIBRARY_SYNONYMS[match.group(0)] if match else None
+
+
+__all__ = ["ALLOWED_LIBRARIES", "LIBRARY_SYNONYMS", "normalize_library"]
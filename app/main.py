@@ -1,20 +1,132 @@
 """FastAPI entrypoint for the room booking agent."""
 
-from fastapi import FastAPI
+import asyncio
+import logging
+import uuid
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+try:  # Optional speedup for response encoding; stdlib JSON otherwise.
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+from app.browser import booking_flow
+from app.browser.booking_flow import BROWSER_POOL
+from app.libraries import ALLOWED_LIBRARIES, normalize_library
 from app.schemas import BookingRequest, BookingResponse
 
-app = FastAPI(title="Unimelb Room Booking Agent", version="0.1.0")
+log = logging.getLogger(__name__)
+
+# Latest status per booking id; bookings run one at a time on the shared browser.
+_JOBS: dict[str, BookingResponse] = {}
+# Past this many jobs the oldest finished ones are forgotten (pending ones never are).
+_MAX_JOBS = 1000
+_FINISHED = ("done", "failed")
+
+
+def _set_job(booking_id: str, response: BookingResponse) -> None:
+    """Record a job's status, dropping the oldest finished jobs over the cap."""
+    _JOBS[booking_id] = response
+    excess = len(_JOBS) - _MAX_JOBS
+    if excess > 0:
+        stale = [job_id for job_id, job in _JOBS.items() if job.status in _FINISHED]
+        for job_id in stale[:excess]:
+            del _JOBS[job_id]
+
+
+def _booking_payload(request: BookingRequest) -> dict[str, object]:
+    """Map the API request onto the example_booking.json keys the flow reads."""
+    return {
+        "preferred_library": normalize_library(request.library),
+        "event_name": request.event_name,
+        "date": request.date.strftime("%d/%m/%Y"),
+        "start_time": request.start_time.strftime("%H:%M"),
+        "end_time": request.end_time.strftime("%H:%M"),
+        "min_capacity": request.room_size,
+    }
+
 
+async def _booking_worker(queue: "asyncio.Queue[tuple[str, BookingRequest]]") -> None:
+    """Run queued bookings one after another on a fresh context of the warm browser."""
+    while True:
+        booking_id, request = await queue.get()
+        _set_job(
+            booking_id,
+            BookingResponse(booking_id=booking_id, status="running", message="Booking in progress"),
+        )
+        try:
+            # The flow reads booking fields from module state, so keep this
+            # set + book pair together (the single worker guarantees that).
+            booking_flow.set_booking_data(_booking_payload(request))
+            async with BROWSER_POOL.session() as page:
+                booked = await booking_flow.book_once(page)
+                if booked is not None:
+                    await booking_flow.save_session(page)
+            if booked:
+                status, message = "done", "Reservation created"
+            elif booked is None:
+                status, message = "failed", "Could not reach the DiBS booking page"
+            else:
+                status, message = "failed", "Could not complete the reservation"
+        except Exception as exc:
+            status, message = "failed", f"Booking flow failed: {exc}"
+        _set_job(booking_id, BookingResponse(booking_id=booking_id, status=status, message=message))
+        queue.task_done()
 
-@app.post("/book_room", response_model=BookingResponse)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Warm Chromium and start the booking worker; stop both on shutdown."""
+    # Pay the browser cold start here rather than in the first booking.
+    try:
+        await BROWSER_POOL.get()
+    except Exception as exc:
+        log.warning("Could not pre-launch Chromium (will retry on first booking): %s", exc)
+    queue: "asyncio.Queue[tuple[str, BookingRequest]]" = asyncio.Queue()
+    app.state.booking_queue = queue
+    worker = asyncio.create_task(_booking_worker(queue))
+    try:
+        yield
+    finally:
+        worker.cancel()
+        await asyncio.gather(worker, return_exceptions=True)
+        await BROWSER_POOL.shutdown()
+
+
+app = FastAPI(
+    title="Unimelb Room Booking Agent",
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse if orjson else JSONResponse,
+)
+
+
+@app.post("/book_room", response_model=BookingResponse, status_code=202)
 async def book_room(request: BookingRequest) -> BookingResponse:
-    """Stub endpoint that accepts booking details and returns a placeholder response."""
-    # Placeholder only; real booking pipeline lives in the CLI + Playwright flow.
-    return BookingResponse(
-        status="stubbed",
-        message="Booking not actually implemented yet",
-    )
+    """Queue a booking and return its id straight away; poll GET /book_room/{id}."""
+    if normalize_library(request.library) is None:
+        known = ", ".join(sorted(ALLOWED_LIBRARIES.values()))
+        raise HTTPException(
+            status_code=422, detail=f"Unknown library {request.library!r}; expected one of: {known}"
+        )
+    booking_id = uuid.uuid4().hex
+    response = BookingResponse(booking_id=booking_id, status="queued", message="Booking queued")
+    _set_job(booking_id, response)
+    await app.state.booking_queue.put((booking_id, request))
+    return response
+
+
+@app.get("/book_room/{booking_id}", response_model=BookingResponse)
+async def booking_status(booking_id: str) -> BookingResponse:
+    """Current status of a queued booking."""
+    try:
+        return _JOBS[booking_id]
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Unknown booking id") from None
 
 
 @app.get("/health")
@@ -21,6 +21,7 @@ class BookingRequest(BaseModel):
 
 class BookingResponse(BaseModel):
     # Lightweight wrapper around status messaging for API clients.
+    booking_id: Optional[str] = Field(None, description="Id to poll GET /book_room/{id} with")
     status: str = Field(..., description="Status of the booking request")
     message: str = Field(..., description="Additional details about the outcome")
 